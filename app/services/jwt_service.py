@@ -1,9 +1,18 @@
 # app/services/jwt_service.py
 from builtins import dict, str
+import hashlib
+import time
+from threading import Lock
 import jwt
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from settings.config import settings
 
+# Successfully decoded payloads keyed by a digest of the token, so repeated requests
+# carrying the same bearer token skip signature verification. Failures are never cached.
+_decoded_tokens = TTLCache(maxsize=10_000, ttl=30)
+_decoded_tokens_lock = Lock()
+
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     # Convert role to uppercase before encoding the JWT
@@ -15,8 +24,17 @@ def create_access_token(*, data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 def decode_token(token: str):
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    with _decoded_tokens_lock:
+        cached = _decoded_tokens.get(key)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at is None or expires_at > time.time():
+            return dict(payload)
     try:
         decoded = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return decoded
     except jwt.PyJWTError:
         return None
+    with _decoded_tokens_lock:
+        _decoded_tokens[key] = (decoded, decoded.get("exp"))
+    return dict(decoded)
@@ -1,10 +1,11 @@
 from builtins import str
 import random
 
+ADJECTIVES = ("clever", "jolly", "brave", "sly", "gentle")
+ANIMALS = ("panda", "fox", "raccoon", "koala", "lion")
+
 
 def generate_nickname() -> str:
     """Generate a URL-safe nickname using adjectives and animal names."""
-    adjectives = ["clever", "jolly", "brave", "sly", "gentle"]
-    animals = ["panda", "fox", "raccoon", "koala", "lion"]
     number = random.randint(0, 999)
-    return f"{random.choice(adjectives)}_{random.choice(animals)}_{number}"
+    return f"{random.choice(ADJECTIVES)}_{random.choice(ANIMALS)}_{number}"
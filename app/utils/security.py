@@ -1,19 +1,22 @@
 # app/security.py
 from builtins import Exception, ValueError, bool, int, str
 import secrets
+from typing import Optional
 import bcrypt
 from logging import getLogger
+from settings.config import settings
 
 # Set up logging
 logger = getLogger(__name__)
 
-def hash_password(password: str, rounds: int = 12) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hashes a password using bcrypt with a specified cost factor.
     
     Args:
         password (str): The plain text password to hash.
         rounds (int): The cost factor that determines the computational cost of hashing.
+            Defaults to the `bcrypt_rounds` setting (12 unless overridden by BCRYPT_ROUNDS).
 
     Returns:
         str: The hashed password.
@@ -21,6 +24,8 @@ def hash_password(password: str, rounds: int = 12) -> str:
     Raises:
         ValueError: If hashing the password fails.
     """
+    if rounds is None:
+        rounds = settings.bcrypt_rounds
     try:
         salt = bcrypt.gensalt(rounds=rounds)
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
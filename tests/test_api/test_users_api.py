@@ -1,20 +1,39 @@
-from builtins import str
+from builtins import next, str
+from functools import lru_cache
+from itertools import count
+from urllib.parse import quote_plus
 import pytest
 from httpx import AsyncClient
 from app.main import app
 from app.models.user_model import User, UserRole
-from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
 from app.services.jwt_service import decode_token
-from unittest.mock import patch
+
+LOGIN_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def _form(username, password):
+    return f"username={quote_plus(username)}&password={quote_plus(password)}".encode()
+
+
+_nicknames = count()
+
+
+def _nickname():
+    return f"nick_{next(_nicknames):06d}"
+
+
+@lru_cache(maxsize=None)
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
 
 
 @pytest.mark.asyncio
 async def test_create_user_access_denied(async_client, user_token, email_service):
-    headers = {"Authorization": f"Bearer {user_token}"}
+    headers = _auth(user_token)
 
     user_data = {
-        "nickname": generate_nickname(),
+        "nickname": _nickname(),
         "email": "test@example.com",
         "password": "sS#fdasrongPassword123!",
     }
@@ -26,52 +45,66 @@ async def test_create_user_access_denied(async_client, user_token, email_service
 
 @pytest.mark.asyncio
 async def test_retrieve_user_access_denied(async_client, verified_user, user_token):
-    headers = {"Authorization": f"Bearer {user_token}"}
+    headers = _auth(user_token)
     response = await async_client.get(f"/users/{verified_user.id}", headers=headers)
     assert response.status_code == 403
 
 
 @pytest.mark.asyncio
-async def test_retrieve_user_access_allowed(async_client, admin_user, admin_token):
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
-    assert response.status_code == 200
-    assert response.json()["id"] == str(admin_user.id)
+async def test_admin_user_lifecycle(async_client, admin_user, admin_token, subtests):
+    headers = _auth(admin_token)
+
+    with subtests.test(msg="retrieve user"):
+        response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["id"] == str(admin_user.id)
+
+    with subtests.test(msg="update email"):
+        updated_data = {"email": f"updated_{admin_user.id}@example.com"}
+        response = await async_client.put(
+            f"/users/{admin_user.id}", json=updated_data, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["email"] == updated_data["email"]
+
+    with subtests.test(msg="update github"):
+        updated_data = {"github_profile_url": "http://www.github.com/kaw393939"}
+        response = await async_client.put(
+            f"/users/{admin_user.id}", json=updated_data, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["github_profile_url"] == updated_data["github_profile_url"]
+
+    with subtests.test(msg="update linkedin"):
+        updated_data = {"linkedin_profile_url": "http://www.linkedin.com/kaw393939"}
+        response = await async_client.put(
+            f"/users/{admin_user.id}", json=updated_data, headers=headers
+        )
+        assert response.status_code == 200
+        assert (
+            response.json()["linkedin_profile_url"] == updated_data["linkedin_profile_url"]
+        )
+
+    with subtests.test(msg="delete user"):
+        delete_response = await async_client.delete(
+            f"/users/{admin_user.id}", headers=headers
+        )
+        assert delete_response.status_code == 204
+
+        fetch_response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
+        assert fetch_response.status_code == 404
 
 
 @pytest.mark.asyncio
 async def test_update_user_email_access_denied(async_client, verified_user, user_token):
     updated_data = {"email": f"updated_{verified_user.id}@example.com"}
-    headers = {"Authorization": f"Bearer {user_token}"}
+    headers = _auth(user_token)
     response = await async_client.put(
         f"/users/{verified_user.id}", json=updated_data, headers=headers
     )
     assert response.status_code == 403
 
 
-@pytest.mark.asyncio
-async def test_update_user_email_access_allowed(async_client, admin_user, admin_token):
-    updated_data = {"email": f"updated_{admin_user.id}@example.com"}
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    response = await async_client.put(
-        f"/users/{admin_user.id}", json=updated_data, headers=headers
-    )
-    assert response.status_code == 200
-    assert response.json()["email"] == updated_data["email"]
-
-
-@pytest.mark.asyncio
-async def test_delete_user(async_client, admin_user, admin_token):
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    delete_response = await async_client.delete(
-        f"/users/{admin_user.id}", headers=headers
-    )
-    assert delete_response.status_code == 204
-
-    fetch_response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
-    assert fetch_response.status_code == 404
-
-
 @pytest.mark.asyncio
 async def test_create_user_invalid_email(async_client):
     user_data = {
@@ -82,19 +115,12 @@ async def test_create_user_invalid_email(async_client):
     assert response.status_code == 422
 
 
-import pytest
-from app.services.jwt_service import decode_token
-from urllib.parse import urlencode
-
-
 @pytest.mark.asyncio
 async def test_login_success(async_client, verified_user):
-
-    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
     response = await async_client.post(
         "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
+        content=_form(verified_user.email, "MySuperPassword$1234"),
+        headers=LOGIN_HEADERS,
     )
 
     assert response.status_code == 200
@@ -109,97 +135,53 @@ async def test_login_success(async_client, verified_user):
     ), "The user role should be AUTHENTICATED"
 
 
-@pytest.mark.asyncio
-async def test_login_user_not_found(async_client):
-    form_data = {
-        "username": "nonexistentuser@here.edu",
-        "password": "DoesNotMatter123!",
-    }
-    response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
-    assert response.status_code == 401
-    assert "Incorrect email or password." in response.json().get("detail", "")
+@pytest.fixture
+def login_email(request):
+    # resolved outside the running test so async user fixtures can be looked up by name
+    if request.param is None:
+        return "nonexistentuser@here.edu"
+    return request.getfixturevalue(request.param).email
 
 
 @pytest.mark.asyncio
-async def test_login_incorrect_password(async_client, verified_user):
-    form_data = {"username": verified_user.email, "password": "IncorrectPassword123!"}
+@pytest.mark.parametrize(
+    "login_email, password, status_code, detail",
+    [
+        (None, "DoesNotMatter123!", 401, "Incorrect email or password."),
+        ("verified_user", "IncorrectPassword123!", 401, "Incorrect email or password."),
+        ("unverified_user", "MySuperPassword$123", 401, ""),
+        (
+            "locked_user",
+            "MySuperPassword$1234",
+            400,
+            "Account locked due to too many failed login attempts.",
+        ),
+    ],
+    indirect=["login_email"],
+    ids=["user_not_found", "incorrect_password", "unverified_user", "locked_user"],
+)
+async def test_login_failures(async_client, login_email, password, status_code, detail):
     response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
-    assert response.status_code == 401
-    assert "Incorrect email or password." in response.json().get("detail", "")
-
-
-@pytest.mark.asyncio
-async def test_login_unverified_user(async_client, unverified_user):
-    form_data = {"username": unverified_user.email, "password": "MySuperPassword$123"}
-    response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
-    assert response.status_code == 401
-
-
-@pytest.mark.asyncio
-async def test_login_locked_user(async_client, locked_user):
-    form_data = {"username": locked_user.email, "password": "MySuperPassword$1234"}
-    response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
-    assert response.status_code == 400
-    assert (
-        "Account locked due to too many failed login attempts."
-        in response.json().get("detail", "")
+        "/login/", content=_form(login_email, password), headers=LOGIN_HEADERS
     )
+    assert response.status_code == status_code
+    assert detail in response.json().get("detail", "")
 
 
 @pytest.mark.asyncio
 async def test_delete_user_does_not_exist(async_client, admin_token):
     non_existent_user_id = "00000000-0000-0000-0000-000000000000"
-    headers = {"Authorization": f"Bearer {admin_token}"}
+    headers = _auth(admin_token)
     delete_response = await async_client.delete(
         f"/users/{non_existent_user_id}", headers=headers
     )
     assert delete_response.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_update_user_github(async_client, admin_user, admin_token):
-    updated_data = {"github_profile_url": "http://www.github.com/kaw393939"}
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    response = await async_client.put(
-        f"/users/{admin_user.id}", json=updated_data, headers=headers
-    )
-    assert response.status_code == 200
-    assert response.json()["github_profile_url"] == updated_data["github_profile_url"]
-
-
-@pytest.mark.asyncio
-async def test_update_user_linkedin(async_client, admin_user, admin_token):
-    updated_data = {"linkedin_profile_url": "http://www.linkedin.com/kaw393939"}
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    response = await async_client.put(
-        f"/users/{admin_user.id}", json=updated_data, headers=headers
-    )
-    assert response.status_code == 200
-    assert (
-        response.json()["linkedin_profile_url"] == updated_data["linkedin_profile_url"]
-    )
-
-
 @pytest.mark.asyncio
 async def test_list_users_as_admin(async_client, admin_token):
     response = await async_client.get(
-        "/users/", headers={"Authorization": f"Bearer {admin_token}"}
+        "/users/", headers=_auth(admin_token)
     )
     assert response.status_code == 200
     assert "items" in response.json()
@@ -208,7 +190,7 @@ async def test_list_users_as_admin(async_client, admin_token):
 @pytest.mark.asyncio
 async def test_list_users_as_manager(async_client, manager_token):
     response = await async_client.get(
-        "/users/", headers={"Authorization": f"Bearer {manager_token}"}
+        "/users/", headers=_auth(manager_token)
     )
     assert response.status_code == 200
 
@@ -216,14 +198,14 @@ async def test_list_users_as_manager(async_client, manager_token):
 @pytest.mark.asyncio
 async def test_list_users_unauthorized(async_client, user_token):
     response = await async_client.get(
-        "/users/", headers={"Authorization": f"Bearer {user_token}"}
+        "/users/", headers=_auth(user_token)
     )
     assert response.status_code == 403
 
 
 @pytest.mark.asyncio
 async def test_create_user_duplicate_nickname(async_client, admin_token):
-    headers = {"Authorization": f"Bearer {admin_token}"}
+    headers = _auth(admin_token)
     nickname = "TestUser123"
 
     user_data_1 = {
@@ -240,65 +222,48 @@ async def test_create_user_duplicate_nickname(async_client, admin_token):
         "role": "ADMIN",
     }
 
-    # Mock the 'send_verification_email' method from the 'EmailService' class
-    with patch(
-        "app.services.email_service.EmailService.send_verification_email"
-    ) as mock_send_email:
-        mock_send_email.return_value = (
-            None  # Assume sending email is successfully mocked
-        )
-
-        # Create the first user
-        response = await async_client.post("/users/", json=user_data_1, headers=headers)
-        assert response.status_code == 201, "Failed to create first user"
-
-        # Attempt to create a second user with the same nickname
-        response = await async_client.post("/users/", json=user_data_2, headers=headers)
-        assert (
-            response.status_code == 400
-        ), "Did not handle duplicate nickname correctly"
+    # Create the first user
+    response = await async_client.post("/users/", json=user_data_1, headers=headers)
+    assert response.status_code == 201, "Failed to create first user"
 
+    # Attempt to create a second user with the same nickname
+    response = await async_client.post("/users/", json=user_data_2, headers=headers)
+    assert (
+        response.status_code == 400
+    ), "Did not handle duplicate nickname correctly"
 
-from unittest.mock import patch
 import pytest
 
 
 @pytest.mark.asyncio
 async def test_create_user_duplicate_email(async_client, admin_token):
-    headers = {"Authorization": f"Bearer {admin_token}"}
+    headers = _auth(admin_token)
     email = "test@example.com"
     user_data_1 = {
-        "nickname": generate_nickname(),
+        "nickname": _nickname(),
         "email": email,
         "password": "sS#fdasrongPassword123!",
         "role": "ADMIN",
     }
 
     user_data_2 = {
-        "nickname": generate_nickname(),
+        "nickname": _nickname(),
         "email": email,
         "password": "AnotherStrongPassword123!",
         "role": "ADMIN",
     }
 
-    with patch(
-        "app.services.email_service.EmailService.send_verification_email"
-    ) as mock_send_email:
-        mock_send_email.return_value = (
-            None  # Assume sending email is successfully mocked
-        )
-
-        # Create the first user
-        response1 = await async_client.post(
-            "/users/", json=user_data_1, headers=headers
-        )
-        assert response1.status_code == 201, "Failed to create first user"
+    # Create the first user
+    response1 = await async_client.post(
+        "/users/", json=user_data_1, headers=headers
+    )
+    assert response1.status_code == 201, "Failed to create first user"
 
-        # Attempt to create a second user with the same email
-        response2 = await async_client.post(
-            "/users/", json=user_data_2, headers=headers
-        )
-        assert response2.status_code == 400, "Duplicate email should result in an error"
+    # Attempt to create a second user with the same email
+    response2 = await async_client.post(
+        "/users/", json=user_data_2, headers=headers
+    )
+    assert response2.status_code == 400, "Duplicate email should result in an error"
 
 
 @pytest.mark.asyncio
@@ -306,7 +271,7 @@ async def test_list_users_invalid_skip_integer(async_client, admin_token):
     response = await async_client.get(
         "/users/",
         params={"skip": -1},
-        headers={"Authorization": f"Bearer {admin_token}"},
+        headers=_auth(admin_token),
     )
     assert response.status_code == 400
     assert response.json()["detail"] == "Skip integer cannot be less than 0"
@@ -317,7 +282,7 @@ async def test_list_users_invalid_limit_integer(async_client, admin_token):
     response = await async_client.get(
         "/users/",
         params={"limit": 0},
-        headers={"Authorization": f"Bearer {admin_token}"},
+        headers=_auth(admin_token),
     )
     assert response.status_code == 400
     assert response.json()["detail"] == "Limit integer cannot be less than 1"
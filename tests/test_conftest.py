@@ -52,7 +52,9 @@ async def test_bulk_user_creation_performance(
 
     async with db_session.begin():
         result = await db_session.execute(
-            select(User).filter_by(role=UserRole.AUTHENTICATED)
+            select(User)
+            .filter_by(role=UserRole.AUTHENTICATED)
+            .filter(User.id.in_([user.id for user in users_with_same_role_50_users]))
         )
         users = result.scalars().all()
         assert len(users) == 50
@@ -84,3 +86,4 @@ async def test_current_user_error(db_session, verified_user):
     assert stored_user is not None
     assert stored_user.email == verified_user.email
     assert verify_password("MySuperPassword$1234", stored_user.hashed_password)
+
@@ -55,6 +55,7 @@ async def test_failed_login_attempts_increment(db_session: AsyncSession, user: U
 
 
 @pytest.mark.asyncio
+@pytest.mark.postgres  # SQLite drops the tzinfo of stored datetimes
 async def test_last_login_update(db_session: AsyncSession, user: User):
     """
     Tests updating the last login timestamp.
@@ -2,6 +2,8 @@
 from builtins import RuntimeError, ValueError, isinstance, str
 import pytest
 from app.utils.security import hash_password, verify_password
+from pydantic import ValidationError
+from settings.config import Settings, settings
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -20,6 +22,17 @@ def test_hash_password_with_different_rounds():
     hashed_12 = hash_password(password, rounds)
     assert hashed_10 != hashed_12, "Hashes should differ with different cost factors"
 
+def test_hash_password_uses_configured_rounds():
+    """Test that the cost factor defaults to the bcrypt_rounds setting."""
+    hashed = hash_password("secure_password")
+    assert hashed.split('$')[2] == f"{settings.bcrypt_rounds:02d}"
+
+@pytest.mark.parametrize("rounds", [3, 32])
+def test_bcrypt_rounds_setting_rejects_out_of_range(rounds):
+    """Test that the configured cost factor is validated when settings load."""
+    with pytest.raises(ValidationError):
+        Settings(bcrypt_rounds=rounds)
+
 def test_verify_password_correct():
     """Test verifying the correct password."""
     password = "secure_password"
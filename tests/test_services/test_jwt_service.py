@@ -0,0 +1,46 @@
+from datetime import timedelta
+import jwt
+from app.services.jwt_service import create_access_token, decode_token
+
+
+def test_decode_token_round_trip():
+    """Test that a freshly created token decodes to its claims."""
+    token = create_access_token(data={"sub": "round-trip", "role": "admin"})
+    decoded = decode_token(token)
+    assert decoded["sub"] == "round-trip"
+    assert decoded["role"] == "ADMIN"
+
+
+def test_decode_token_reuses_cached_payload(mocker):
+    """Test that decoding the same token twice only verifies the signature once."""
+    spy = mocker.spy(jwt, "decode")
+    token = create_access_token(data={"sub": "cached", "role": "ADMIN"})
+    first = decode_token(token)
+    second = decode_token(token)
+    assert first == second
+    assert spy.call_count == 1
+
+
+def test_decode_token_does_not_cache_invalid_token(mocker):
+    """Test that tokens failing verification are decoded again on every call."""
+    spy = mocker.spy(jwt, "decode")
+    assert decode_token("not-a-valid-token") is None
+    assert decode_token("not-a-valid-token") is None
+    assert spy.call_count == 2
+
+
+def test_decode_token_skips_expired_cache_entry(mocker):
+    """Test that a cached payload is not served once its exp claim has passed."""
+    token = create_access_token(data={"sub": "expiring", "role": "ADMIN"}, expires_delta=timedelta(minutes=5))
+    assert decode_token(token) is not None
+    spy = mocker.spy(jwt, "decode")
+    mocker.patch("app.services.jwt_service.time.time", return_value=float("inf"))
+    decode_token(token)
+    assert spy.call_count == 1
+
+
+def test_decode_token_returns_copy():
+    """Test that mutating a returned payload does not leak into later decodes."""
+    token = create_access_token(data={"sub": "copy", "role": "ADMIN"})
+    decode_token(token)["sub"] = "tampered"
+    assert decode_token(token)["sub"] == "copy"